@@ -1,71 +1,322 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import httpx
 import pandas as pd
 import datetime
-from typing import Tuple, Optional
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Optional, Any
 import time
+import threading
 from functools import lru_cache
+from cachetools import TTLCache
 
-class PolygonAPIClient:
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Everything the analysis and chart views need for one watchlist entry
+TickerBundle = namedtuple('TickerBundle', ['weekly', 'daily', 'price'])
+
+# Statuses retried with exponential backoff, by both the sync session and the async path
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+# Longest Retry-After delay honoured on the async path; longer waits are capped
+MAX_RETRY_AFTER = 10.0
+
+# (today, monotonic expiry): all requests in a batch share one date range, and
+# date.today() is re-read at most once a minute
+_today_holder = (None, 0.0)
+
+@lru_cache(maxsize=16)
+def _date_range(today: datetime.date, days: int) -> Tuple[str, str]:
+    """Formatted (start, end) dates for a lookback of `days` ending today"""
+    return (today - datetime.timedelta(days=days)).isoformat(), today.isoformat()
+
+class NotModified(Exception):
+    """Raised when Polygon answers a conditional request with 304 Not Modified"""
+
+class ClientResources:
+    """HTTP session, worker pool and caches shared by all clients in a process"""
+    
     def __init__(self):
-        """Initialize the Polygon.io API client"""
+        """Create the pooled session, bundle workers and TTL caches"""
+        # Pooled keep-alive session so repeated calls reuse the TLS connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUSES)
+        )
+        self.session.mount('https://', adapter)
+        # Ask for compressed payloads; urllib3 lists br only when brotli is installed,
+        # so we never advertise an encoding that cannot be decoded
+        self.session.headers.update({'Accept-Encoding': ACCEPT_ENCODING, 'Connection': 'keep-alive'})
+        
+        # Workers for fetching the parts of a ticker bundle in parallel
+        self.executor = ThreadPoolExecutor(max_workers=8)
+        
+        # Bounded TTL caches; expired entries are evicted on access/insert
+        self.bars_cache = TTLCache(maxsize=512, ttl=3600)  # 1 hour cache
+        self.price_cache = TTLCache(maxsize=2048, ttl=600)  # 10 minute cache
+        self.earnings_cache = TTLCache(maxsize=512, ttl=86400)  # 24 hour cache
+        self.bundle_cache = TTLCache(maxsize=512, ttl=600)  # bars only; prices come from price_cache
+        # Last seen (df, etag, last_modified) per bars key, kept past the bars TTL
+        # so an expired entry can be revalidated instead of refetched
+        self.validators = TTLCache(maxsize=512, ttl=7 * 86400)
+        self.cache_lock = threading.RLock()
+    
+    def clear_caches(self) -> None:
+        """Drop every cached API response"""
+        with self.cache_lock:
+            self.bars_cache.clear()
+            self.price_cache.clear()
+            self.earnings_cache.clear()
+            self.bundle_cache.clear()
+            self.validators.clear()
+    
+    def close(self) -> None:
+        """Shut down the worker pool and close pooled connections"""
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+class PolygonAPIClient:
+    def __init__(self, api_key: Optional[str] = None, resources: Optional[ClientResources] = None):
+        """Initialize the Polygon.io API client, optionally on shared resources"""
         self.base_url = "https://api.polygon.io"
-        self.api_key = None
-        self._cache = {}
+        # Fixed for the client's lifetime so one instance is safe to share across threads
+        self._api_key = api_key
         
-    def set_api_key(self, api_key: str) -> None:
-        """Set the API key for requests"""
-        self.api_key = api_key
+        self._owns_resources = resources is None
+        self._resources = resources or ClientResources()
+        self._session = self._resources.session
+        self._executor = self._resources.executor
+        self._bars_cache = self._resources.bars_cache
+        self._price_cache = self._resources.price_cache
+        self._earnings_cache = self._resources.earnings_cache
+        self._bundle_cache = self._resources.bundle_cache
+        self._validators = self._resources.validators
+        self._cache_lock = self._resources.cache_lock
     
-    def _make_request(self, endpoint: str, params: dict) -> dict:
-        """Make a request to the Polygon.io API with error handling"""
-        if not self.api_key:
+    def _send(self, endpoint: str, params: dict, extra_headers: Optional[dict] = None) -> requests.Response:
+        """Send a GET request to the Polygon.io API with error handling"""
+        if not self._api_key:
             raise ValueError("API key not set")
         
-        params['apiKey'] = self.api_key
+        params['apiKey'] = self._api_key
         url = f"{self.base_url}{endpoint}"
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._session.get(url, params=params, headers=extra_headers, timeout=10)
+            if response.status_code == 304:
+                raise NotModified(endpoint)
             response.raise_for_status()
-            return response.json()
+            return response
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error fetching data from Polygon.io: {e}")
     
+    @staticmethod
+    def _parse_response(response) -> dict:
+        """Decode a JSON response body"""
+        try:
+            return json_loads(response.content)
+        except ValueError as e:
+            raise Exception(f"Error fetching data from Polygon.io: {e}")
+    
+    def _make_request(self, endpoint: str, params: dict, extra_headers: Optional[dict] = None) -> dict:
+        """Make a request to the Polygon.io API with error handling"""
+        return self._parse_response(self._send(endpoint, params, extra_headers))
+    
+    def async_client(self) -> httpx.AsyncClient:
+        """Create an HTTP/2 client for a batch of concurrent async requests"""
+        # httpx clients are bound to the event loop they run on, so callers open
+        # one per batch with `async with` and pass it to the *_async methods.
+        # An explicit transport takes over pooling, so limits and http2 go on it; its
+        # retries only cover failed connects, and _send_async retries on status codes
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            retries=RETRY_TOTAL
+        )
+        return httpx.AsyncClient(transport=transport, timeout=10.0)
+    
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a failed status, honouring Retry-After"""
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+        return RETRY_BACKOFF * 2 ** attempt
+    
+    async def _send_async(self, client: httpx.AsyncClient, endpoint: str, params: dict,
+                          extra_headers: Optional[dict] = None) -> httpx.Response:
+        """Async counterpart of _send using a shared httpx client"""
+        if not self._api_key:
+            raise ValueError("API key not set")
+        
+        params['apiKey'] = self._api_key
+        url = f"{self.base_url}{endpoint}"
+        
+        try:
+            response = await client.get(url, params=params, headers=extra_headers)
+            for attempt in range(RETRY_TOTAL):
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                await asyncio.sleep(self._retry_delay(response, attempt))
+                response = await client.get(url, params=params, headers=extra_headers)
+            if response.status_code == 304:
+                raise NotModified(endpoint)
+            response.raise_for_status()
+            return response
+        except httpx.HTTPError as e:
+            raise Exception(f"Error fetching data from Polygon.io: {e}")
+    
+    async def _make_request_async(self, client: httpx.AsyncClient, endpoint: str, params: dict,
+                                  extra_headers: Optional[dict] = None) -> dict:
+        """Async counterpart of _make_request using a shared httpx client"""
+        return self._parse_response(await self._send_async(client, endpoint, params, extra_headers))
+    
+    def _get_cached(self, cache: TTLCache, cache_key: str) -> Optional[Any]:
+        """Return a cached value, or None if it is missing or expired"""
+        with self._cache_lock:
+            try:
+                return cache[cache_key]
+            except KeyError:
+                return None
+    
+    def _set_cached(self, cache: TTLCache, cache_key: str, value: Any) -> None:
+        """Store a value in one of the TTL caches"""
+        with self._cache_lock:
+            cache[cache_key] = value
+    
+    @staticmethod
+    def _bars_to_dataframe(data: dict) -> pd.DataFrame:
+        """Convert a Polygon aggregates payload into an OHLCV DataFrame"""
+        df = pd.DataFrame.from_records(data['results'], columns=['o', 'h', 'l', 'c', 'v', 't'])
+        df.columns = ['Open', 'High', 'Low', 'Close', 'Volume', 'Date']
+        # Keep a datetime64 index (not datetime.date objects) so pandas stays vectorized
+        df['Date'] = pd.to_datetime(df['Date'], unit='ms').dt.floor('D')
+        df.set_index('Date', inplace=True)
+        return df.astype('float64')
+    
+    @staticmethod
+    def _today_cached() -> datetime.date:
+        """Today's date, refreshed at most once a minute"""
+        global _today_holder
+        today, expiry = _today_holder
+        now = time.monotonic()
+        if today is None or now >= expiry:
+            today = datetime.date.today()
+            _today_holder = (today, now + 60)
+        return today
+    
+    def _daily_endpoint(self, ticker: str, period_days: int) -> Tuple[str, dict]:
+        """Build the daily aggregates endpoint and query params"""
+        start_date, today = _date_range(self._today_cached(), period_days)
+        
+        endpoint = f"/v2/aggs/ticker/{ticker}/range/1/day/{start_date}/{today}"
+        params = {'adjusted': 'true', 'sort': 'asc', 'limit': 5000}
+        return endpoint, params
+    
+    def _weekly_endpoint(self, ticker: str) -> Tuple[str, dict]:
+        """Build the weekly aggregates endpoint and query params"""
+        one_year_ago, today = _date_range(self._today_cached(), 365)
+        
+        endpoint = f"/v2/aggs/ticker/{ticker}/range/1/week/{one_year_ago}/{today}"
+        params = {'sort': 'asc', 'limit': 5000}
+        return endpoint, params
+    
+    def _conditional_headers(self, cache_key: str) -> dict:
+        """Build If-None-Match / If-Modified-Since headers for a previously seen bars key"""
+        validators = self._get_cached(self._validators, cache_key)
+        if validators is None:
+            return {}
+        
+        _, etag, last_modified = validators
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    def _revalidate_bars(self, cache_key: str) -> Tuple[pd.DataFrame, str]:
+        """Reuse the last DataFrame for a key after a 304 and restart its TTL"""
+        validators = self._get_cached(self._validators, cache_key)
+        if validators is None:
+            return pd.DataFrame(), "Cached data expired, please retry."
+        
+        df = validators[0]
+        self._set_cached(self._bars_cache, cache_key, df)
+        return df, ""
+    
+    def _store_bars(self, cache_key: str, response, empty_message: str) -> Tuple[pd.DataFrame, str]:
+        """Build and cache a DataFrame from an aggregates response"""
+        data = self._parse_response(response)
+        if not data.get('results'):
+            return pd.DataFrame(), empty_message
+        
+        df = self._bars_to_dataframe(data)
+        
+        # Cache the result
+        self._set_cached(self._bars_cache, cache_key, df)
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._set_cached(self._validators, cache_key, (df, etag, last_modified))
+        
+        return df, ""
+    
+    def _store_price(self, cache_key: str, data: dict) -> Tuple[Optional[float], str]:
+        """Extract and cache the previous close from a /prev payload"""
+        if data.get('results') and data['results']:
+            price = data['results'][0]['c']
+            # Cache the result
+            self._set_cached(self._price_cache, cache_key, price)
+            return price, ""
+        return None, "Price not found."
+    
     def get_daily_data(self, ticker: str, period_days: int = 90) -> Tuple[pd.DataFrame, str]:
         """Fetch daily stock data for a given ticker"""
         cache_key = f"daily_{ticker}_{period_days}"
         
-        # Check cache (simple time-based caching)
-        if cache_key in self._cache:
-            cached_data, cached_time = self._cache[cache_key]
-            if time.time() - cached_time < 3600:  # 1 hour cache
-                return cached_data, ""
+        # Check cache
+        cached_data = self._get_cached(self._bars_cache, cache_key)
+        if cached_data is not None:
+            return cached_data, ""
         
-        today = datetime.date.today()
-        start_date = today - datetime.timedelta(days=period_days)
+        endpoint, params = self._daily_endpoint(ticker, period_days)
         
-        endpoint = f"/v2/aggs/ticker/{ticker}/range/1/day/{start_date}/{today}"
-        params = {'adjusted': 'true', 'sort': 'asc', 'limit': 5000}
+        try:
+            response = self._send(endpoint, params, self._conditional_headers(cache_key))
+            return self._store_bars(cache_key, response, f"No daily data found for {ticker}.")
+        except NotModified:
+            return self._revalidate_bars(cache_key)
+        except Exception as e:
+            return pd.DataFrame(), str(e)
+    
+    async def get_daily_data_async(self, client: httpx.AsyncClient, ticker: str,
+                                   period_days: int = 90) -> Tuple[pd.DataFrame, str]:
+        """Async counterpart of get_daily_data"""
+        cache_key = f"daily_{ticker}_{period_days}"
+        
+        cached_data = self._get_cached(self._bars_cache, cache_key)
+        if cached_data is not None:
+            return cached_data, ""
+        
+        endpoint, params = self._daily_endpoint(ticker, period_days)
         
         try:
-            data = self._make_request(endpoint, params)
-            
-            if not data.get('results'):
-                return pd.DataFrame(), f"No daily data found for {ticker}."
-            
-            df = pd.DataFrame(data['results'])
-            df.rename(columns={
-                'o': 'Open', 'h': 'High', 'l': 'Low', 
-                'c': 'Close', 'v': 'Volume', 't': 'Date'
-            }, inplace=True)
-            df['Date'] = pd.to_datetime(df['Date'], unit='ms').dt.date
-            df.set_index('Date', inplace=True)
-            
-            # Cache the result
-            self._cache[cache_key] = (df, time.time())
-            
-            return df, ""
-            
+            response = await self._send_async(client, endpoint, params, self._conditional_headers(cache_key))
+            return self._store_bars(cache_key, response, f"No daily data found for {ticker}.")
+        except NotModified:
+            return self._revalidate_bars(cache_key)
         except Exception as e:
             return pd.DataFrame(), str(e)
     
@@ -74,36 +325,35 @@ class PolygonAPIClient:
         cache_key = f"weekly_{ticker}"
         
         # Check cache
-        if cache_key in self._cache:
-            cached_data, cached_time = self._cache[cache_key]
-            if time.time() - cached_time < 3600:  # 1 hour cache
-                return cached_data, ""
+        cached_data = self._get_cached(self._bars_cache, cache_key)
+        if cached_data is not None:
+            return cached_data, ""
         
-        today = datetime.date.today()
-        one_year_ago = today - datetime.timedelta(days=365)
+        endpoint, params = self._weekly_endpoint(ticker)
         
-        endpoint = f"/v2/aggs/ticker/{ticker}/range/1/week/{one_year_ago}/{today}"
-        params = {'sort': 'asc', 'limit': 5000}
+        try:
+            response = self._send(endpoint, params, self._conditional_headers(cache_key))
+            return self._store_bars(cache_key, response, f"No weekly data found for {ticker}.")
+        except NotModified:
+            return self._revalidate_bars(cache_key)
+        except Exception as e:
+            return pd.DataFrame(), str(e)
+    
+    async def get_weekly_data_async(self, client: httpx.AsyncClient, ticker: str) -> Tuple[pd.DataFrame, str]:
+        """Async counterpart of get_weekly_data"""
+        cache_key = f"weekly_{ticker}"
+        
+        cached_data = self._get_cached(self._bars_cache, cache_key)
+        if cached_data is not None:
+            return cached_data, ""
+        
+        endpoint, params = self._weekly_endpoint(ticker)
         
         try:
-            data = self._make_request(endpoint, params)
-            
-            if not data.get('results'):
-                return pd.DataFrame(), f"No weekly data found for {ticker}."
-            
-            df = pd.DataFrame(data['results'])
-            df.rename(columns={
-                'o': 'Open', 'h': 'High', 'l': 'Low', 
-                'c': 'Close', 'v': 'Volume', 't': 'Date'
-            }, inplace=True)
-            df['Date'] = pd.to_datetime(df['Date'], unit='ms').dt.date
-            df.set_index('Date', inplace=True)
-            
-            # Cache the result
-            self._cache[cache_key] = (df, time.time())
-            
-            return df, ""
-            
+            response = await self._send_async(client, endpoint, params, self._conditional_headers(cache_key))
+            return self._store_bars(cache_key, response, f"No weekly data found for {ticker}.")
+        except NotModified:
+            return self._revalidate_bars(cache_key)
         except Exception as e:
             return pd.DataFrame(), str(e)
     
@@ -112,37 +362,96 @@ class PolygonAPIClient:
         cache_key = f"price_{ticker}"
         
         # Check cache (shorter cache time for prices)
-        if cache_key in self._cache:
-            cached_data, cached_time = self._cache[cache_key]
-            if time.time() - cached_time < 600:  # 10 minute cache
-                return cached_data, ""
+        cached_data = self._get_cached(self._price_cache, cache_key)
+        if cached_data is not None:
+            return cached_data, ""
         
         endpoint = f"/v2/aggs/ticker/{ticker}/prev"
         params = {}
         
         try:
             data = self._make_request(endpoint, params)
-            
-            if data.get('results') and data['results']:
-                price = data['results'][0]['c']
-                # Cache the result
-                self._cache[cache_key] = (price, time.time())
-                return price, ""
-            else:
-                return None, "Price not found."
-                
+            return self._store_price(cache_key, data)
+        except Exception as e:
+            return None, str(e)
+    
+    async def get_current_price_async(self, client: httpx.AsyncClient, ticker: str) -> Tuple[Optional[float], str]:
+        """Async counterpart of get_current_price"""
+        cache_key = f"price_{ticker}"
+        
+        cached_data = self._get_cached(self._price_cache, cache_key)
+        if cached_data is not None:
+            return cached_data, ""
+        
+        endpoint = f"/v2/aggs/ticker/{ticker}/prev"
+        params = {}
+        
+        try:
+            data = await self._make_request_async(client, endpoint, params)
+            return self._store_price(cache_key, data)
         except Exception as e:
             return None, str(e)
     
+    def _make_bundle(self, cache_key: Tuple[str, str], asset_type: str, weekly_df: pd.DataFrame,
+                     daily_df: pd.DataFrame, price: Optional[float]) -> TickerBundle:
+        """Assemble a ticker bundle and cache its bars if both were fetched"""
+        if asset_type != 'Stock':  # Options are analyzed on daily bars only
+            weekly_df = daily_df
+        
+        # The price is left out so a cached entry never outlives its price_cache entry
+        if not weekly_df.empty and not daily_df.empty:
+            self._set_cached(self._bundle_cache, cache_key, (weekly_df, daily_df))
+        return TickerBundle(weekly_df, daily_df, price)
+    
+    def get_ticker_bundle(self, ticker: str, asset_type: str) -> TickerBundle:
+        """Fetch weekly bars, 90-day daily bars and current price in parallel"""
+        cache_key = (ticker, asset_type)
+        bars = self._get_cached(self._bundle_cache, cache_key)
+        if bars is not None:
+            price, _ = self.get_current_price(ticker)
+            return TickerBundle(*bars, price)
+        
+        price_future = self._executor.submit(self.get_current_price, ticker)
+        daily_future = self._executor.submit(self.get_daily_data, ticker, 90)
+        if asset_type == 'Stock':
+            weekly_df, _ = self.get_weekly_data(ticker)
+        else:
+            weekly_df = pd.DataFrame()
+        
+        price, _ = price_future.result()
+        daily_df, _ = daily_future.result()
+        return self._make_bundle(cache_key, asset_type, weekly_df, daily_df, price)
+    
+    async def get_ticker_bundle_async(self, client: httpx.AsyncClient, ticker: str,
+                                      asset_type: str) -> TickerBundle:
+        """Async counterpart of get_ticker_bundle"""
+        cache_key = (ticker, asset_type)
+        bars = self._get_cached(self._bundle_cache, cache_key)
+        if bars is not None:
+            price, _ = await self.get_current_price_async(client, ticker)
+            return TickerBundle(*bars, price)
+        
+        fetches = [
+            self.get_current_price_async(client, ticker),
+            self.get_daily_data_async(client, ticker, period_days=90)
+        ]
+        if asset_type == 'Stock':
+            fetches.append(self.get_weekly_data_async(client, ticker))
+        
+        results = await asyncio.gather(*fetches)
+        price, _ = results[0]
+        daily_df, _ = results[1]
+        weekly_df = results[2][0] if asset_type == 'Stock' else pd.DataFrame()
+        return self._make_bundle(cache_key, asset_type, weekly_df, daily_df, price)
+    
     def get_next_earnings_date(self, ticker: str) -> Tuple[Optional[str], str]:
         """Fetch the next upcoming earnings date for a ticker"""
         cache_key = f"earnings_{ticker}"
         
         # Check cache (24 hour cache for earnings)
-        if cache_key in self._cache:
-            cached_data, cached_time = self._cache[cache_key]
-            if time.time() - cached_time < 86400:  # 24 hour cache
-                return cached_data, ""
+        cached_data = self._get_cached(self._earnings_cache, cache_key)
+        if cached_data is not None:
+            return cached_data, ""
         
         endpoint = f"/v3/reference/tickers/{ticker}/events"
         params = {}
@@ -160,18 +469,22 @@ class PolygonAPIClient:
                 earnings_events = [event for event in events if event.get('type') == 'earnings']
                 
                 if earnings_events:
-                    # Sort by date and get the next one
-                    earnings_events.sort(key=lambda x: x.get('date', ''))
-                    next_earnings = earnings_events[0]['date']
+                    # Only the earliest date is needed, so take the min instead of sorting
+                    next_earnings = min(earnings_events, key=lambda x: x.get('date', ''))['date']
                     # Cache the result
-                    self._cache[cache_key] = (next_earnings, time.time())
+                    self._set_cached(self._earnings_cache, cache_key, next_earnings)
                     return next_earnings, ""
             
             return None, "No upcoming earnings found."
-            
+        
         except Exception as e:
             return None, str(e)
     
     def clear_cache(self) -> None:
         """Clear the API cache"""
-        self._cache.clear()
\ No newline at end of file
+        self._resources.clear_caches()
+    
+    def close(self) -> None:
+        """Close the HTTP session and worker pool if this client owns them"""
+        if self._owns_resources:
+            self._resources.close()
\ No newline at end of file
@@ -1,13 +1,18 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, g
 from flask_session import Session
 import os
 import json
+import atexit
+import asyncio
+import threading
 from datetime import datetime, timedelta
 from database import DatabaseManager
-from api_client import PolygonAPIClient
+from api_client import PolygonAPIClient, ClientResources
 from technical_analysis import TechnicalAnalyzer
 import plotly.graph_objects as go
 import plotly.utils
+import pandas as pd
+from cachetools import LRUCache, cached
 from werkzeug.utils import secure_filename
 
 app = Flask(__name__)
@@ -18,10 +23,37 @@ app.config['SESSION_TYPE'] = 'filesystem'
 app.config['SESSION_PERMANENT'] = False
 Session(app)
 
-# Initialize components
+# Analysis criteria checkboxes accepted by /analyze
+CRITERIA_KEYS = (
+    'avoid_squeeze',
+    'rsi_confirmation',
+    'dmi_confirmation',
+    'ema_crossover',
+    'macd_crossover',
+    'weekly_macd',
+    'next_earning_date'
+)
+
+# Result keys that describe the ticker rather than a criterion outcome
+NONCRITERION_KEYS = frozenset({'ticker', 'asset_type', 'current_price'})
+
+# Initialize components; the HTTP session and caches are shared per worker process,
+# while each request gets its own PolygonAPIClient bound to the caller's API key
 db = DatabaseManager()
-api_client = PolygonAPIClient()
+app.extensions['polygon'] = ClientResources()
 analyzer = TechnicalAnalyzer()
+atexit.register(app.extensions['polygon'].close)
+atexit.register(db.close)
+
+def create_api_client(api_key):
+    """Create a Polygon client for one request on top of the shared resources"""
+    return PolygonAPIClient(api_key, app.extensions['polygon'])
+
+def get_api_client():
+    """Return the current request's Polygon client, creating it on first use"""
+    if 'api_client' not in g:
+        g.api_client = create_api_client(session.get('api_key'))
+    return g.api_client
 
 @app.route('/')
 def index():
@@ -68,6 +100,42 @@ def remove_ticker(ticker):
         flash(f'Error removing {ticker} from watchlist.', 'error')
     return redirect(url_for('index'))
 
+async def _fetch_bundle(api_client, client, ticker_data, semaphore):
+    """Get current price plus weekly/daily bars for a single watchlist entry"""
+    async with semaphore:
+        return await api_client.get_ticker_bundle_async(client, ticker_data['ticker'], ticker_data['asset_type'])
+
+def _has_signal(result):
+    """True if the result passes (or warns on) at least one criterion"""
+    return any(value.get('status') in ['✅', '⚠️'] for key, value in result.items()
+               if key not in NONCRITERION_KEYS)
+
+async def _analyze_tickers(api_client, watchlist, criteria):
+    """Fetch all watchlist entries concurrently over one HTTP/2 connection, then analyze them together"""
+    semaphore = asyncio.Semaphore(8)
+    async with api_client.async_client() as client:
+        bundles = await asyncio.gather(*[
+            _fetch_bundle(api_client, client, ticker_data, semaphore)
+            for ticker_data in watchlist
+        ])
+    
+    # Indicators for the whole watchlist run as one vectorised batch off the event loop;
+    # its records only become per-ticker dicts here, for the response
+    records = await asyncio.to_thread(
+        analyzer.analyze_batch,
+        watchlist, [bundle.daily for bundle in bundles], [bundle.weekly for bundle in bundles], criteria
+    )
+    batch_checks = analyzer.checks_from_batch(watchlist, records, criteria)
+    
+    # Price and earnings (blocking I/O) are added per ticker, keeping only tickers that
+    # pass (or warn on) at least one criterion
+    tickers = [ticker_data['ticker'] for ticker_data in watchlist]
+    return await asyncio.to_thread(
+        analyzer.analyze_many,
+        watchlist, dict(zip(tickers, bundles)), criteria, api_client, dict(zip(tickers, batch_checks)),
+        _has_signal
+    )
+
 @app.route('/analyze', methods=['POST'])
 def analyze_watchlist():
     """Analyze all tickers in watchlist against selected criteria"""
@@ -77,58 +145,34 @@ def analyze_watchlist():
         return redirect(url_for('index'))
     
     # Get selected criteria
-    criteria = {
-        'avoid_squeeze': 'avoid_squeeze' in request.form,
-        'rsi_confirmation': 'rsi_confirmation' in request.form,
-        'dmi_confirmation': 'dmi_confirmation' in request.form,
-        'ema_crossover': 'ema_crossover' in request.form,
-        'macd_crossover': 'macd_crossover' in request.form,
-        'weekly_macd': 'weekly_macd' in request.form,
-        'next_earning_date': 'next_earning_date' in request.form
-    }
+    form = request.form
+    criteria = {key: key in form for key in CRITERIA_KEYS}
     
     watchlist = db.get_watchlist()
     if not watchlist:
         flash('Your watchlist is empty. Please add some tickers first.', 'error')
         return redirect(url_for('index'))
     
-    # Analyze each ticker
-    results = []
-    for ticker_data in watchlist:
-        ticker = ticker_data['ticker']
-        asset_type = ticker_data['asset_type']
-        
-        # Initialize API client with key
-        api_client.set_api_key(api_key)
-        
-        # Get current price
-        current_price, price_error = api_client.get_current_price(ticker)
-        
-        # Get data based on asset type
-        if asset_type == 'Stock':
-            data_df, data_error = api_client.get_weekly_data(ticker)
-            daily_df, _ = api_client.get_daily_data(ticker, period_days=90)
-        else:  # Option
-            data_df, data_error = api_client.get_daily_data(ticker, period_days=90)
-            daily_df = data_df.copy()
-        
-        # Analyze ticker
-        result = analyzer.analyze_ticker(
-            ticker, asset_type, data_df, daily_df, current_price, criteria, api_client
-        )
-        
-        if result:
-            results.append(result)
-    
-    # Filter for passing tickers
-    passing_results = [
-        result for result in results 
-        if any(value.get('status') in ['✅', '⚠️'] for key, value in result.items() 
-               if key not in ['ticker', 'asset_type', 'current_price'])
-    ]
+    # Analyze tickers concurrently; each one is dominated by network I/O
+    passing_results = asyncio.run(_analyze_tickers(get_api_client(), watchlist, criteria))
     
     return render_template('results.html', results=passing_results, criteria=criteria)
 
+def _frame_hash(df):
+    """Content hash of a DataFrame, including its index"""
+    return int(pd.util.hash_pandas_object(df).sum())
+
+@cached(
+    LRUCache(maxsize=256),
+    key=lambda ticker, chart_type, daily_df, weekly_df, asset_type: (
+        ticker, chart_type, asset_type, _frame_hash(daily_df), _frame_hash(weekly_df)
+    ),
+    lock=threading.Lock()
+)
+def _serialize_chart(ticker, chart_type, daily_df, weekly_df, asset_type):
+    """Build chart JSON; a chart is deterministic in its input bars, so it is memoized"""
+    return analyzer.generate_chart(ticker, chart_type, daily_df, weekly_df, asset_type)
+
 @app.route('/chart/<ticker>/<chart_type>')
 def get_chart(ticker, chart_type):
     """Generate and return chart data for a specific ticker"""
@@ -136,12 +180,11 @@ def get_chart(ticker, chart_type):
     if not api_key:
         return jsonify({'error': 'API key not set'})
     
-    api_client.set_api_key(api_key)
+    api_client = get_api_client()
     
     try:
         # Get ticker data from database
-        watchlist = db.get_watchlist()
-        ticker_info = next((t for t in watchlist if t['ticker'] == ticker), None)
+        ticker_info = db.get_ticker_info(ticker)
         
         if not ticker_info:
             return jsonify({'error': 'Ticker not found in watchlist'})
@@ -149,18 +192,13 @@ def get_chart(ticker, chart_type):
         asset_type = ticker_info['asset_type']
         
         # Get appropriate data
-        if asset_type == 'Stock':
-            weekly_df, _ = api_client.get_weekly_data(ticker)
-            daily_df, _ = api_client.get_daily_data(ticker, period_days=90)
-        else:
-            daily_df, _ = api_client.get_daily_data(ticker, period_days=90)
-            weekly_df = daily_df.copy()
+        bundle = api_client.get_ticker_bundle(ticker, asset_type)
         
         # Generate chart based on type
-        chart_json = analyzer.generate_chart(ticker, chart_type, daily_df, weekly_df, asset_type)
+        chart_json = _serialize_chart(ticker, chart_type, bundle.daily, bundle.weekly, asset_type)
         
         return jsonify({'chart': chart_json})
-        
+    
     except Exception as e:
         return jsonify({'error': str(e)})
 
@@ -173,14 +211,13 @@ def ticker_detail(ticker):
         return redirect(url_for('index'))
     
     # Get ticker from watchlist
-    watchlist = db.get_watchlist()
-    ticker_info = next((t for t in watchlist if t['ticker'] == ticker), None)
+    ticker_info = db.get_ticker_info(ticker)
     
     if not ticker_info:
         flash('Ticker not found in watchlist.', 'error')
         return redirect(url_for('index'))
     
-    api_client.set_api_key(api_key)
+    api_client = get_api_client()
     
     # Get current price
     current_price, price_error = api_client.get_current_price(ticker)
@@ -0,0 +1,21 @@
+from numba.pycc import CC
+import jit_kernels
+
+# Compile the indicator kernels ahead of time into the ta_kernels extension
+# module, next to this file. Run once per deployment image:
+#
+#     python build_kernels.py
+#
+# technical_analysis imports ta_kernels when present and otherwise JIT compiles the
+# same functions from jit_kernels on first use.
+
+cc = CC('ta_kernels')
+
+cc.export('wilder_smooth', 'void(f8[:], f8[:], i8)')(jit_kernels.wilder_smooth.py_func)
+cc.export('adx_dmi', 'UniTuple(f8[:], 3)(f8[:], f8[:], f8[:], i8)')(jit_kernels.adx_dmi.py_func)
+cc.export('ema_pair', 'UniTuple(f8[:], 2)(f8[:], i8, i8)')(jit_kernels.ema_pair.py_func)
+cc.export('rsi_batch', 'f8[:, :](f8[:, :], i8[:], i8)')(jit_kernels.rsi_batch.py_func)
+cc.export('dmi_batch', 'UniTuple(f8[:, :], 3)(f8[:, :], f8[:, :], f8[:, :], i8[:], i8)')(jit_kernels.dmi_batch.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
\ No newline at end of file
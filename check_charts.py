@@ -0,0 +1,49 @@
+import json
+import sys
+import numpy as np
+import pandas as pd
+import plotly
+from technical_analysis import TechnicalAnalyzer
+
+# Render every chart type from synthetic bars and fail if any of them comes back as the
+# error chart. Run it against the pinned requirements after upgrading plotly or orjson:
+#
+#     python check_charts.py
+
+CHART_TYPES = ('rsi', 'macd', 'weekly_macd', 'ema', 'dmi')
+
+def synthetic_bars(periods: int, freq: str) -> pd.DataFrame:
+    """Random-walk OHLCV bars shaped like the API client's DataFrames"""
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    index = pd.date_range('2024-01-01', periods=periods, freq=freq)
+    return pd.DataFrame({
+        'Open': close - 0.5,
+        'High': close + rng.uniform(0, 2, periods),
+        'Low': close - rng.uniform(0, 2, periods),
+        'Close': close,
+        'Volume': rng.uniform(1e5, 1e6, periods)
+    }, index=index)
+
+def main() -> int:
+    """Return a non-zero exit code if any chart fails to serialize"""
+    analyzer = TechnicalAnalyzer()
+    daily_df = synthetic_bars(90, 'D')
+    weekly_df = synthetic_bars(52, 'W')
+    
+    failures = 0
+    for chart_type in CHART_TYPES:
+        figure = json.loads(analyzer.generate_chart('TEST', chart_type, daily_df, weekly_df, 'Stock'))
+        annotations = figure.get('layout', {}).get('annotations', [])
+        if not figure.get('data') or annotations:
+            failures += 1
+            message = annotations[0]['text'] if annotations else 'no traces'
+            print(f"{chart_type}: FAILED ({message})")
+        else:
+            print(f"{chart_type}: ok")
+    
+    print(f"plotly {plotly.__version__}: {failures} failing chart type(s)")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -1,5 +1,6 @@
 import sqlite3
 import datetime
+import threading
 from typing import List, Dict, Optional, Tuple
 import os
 
@@ -8,11 +9,27 @@ class DatabaseManager:
         """Initialize database manager with specified database path"""
         self.db_path = db_path
         
+        # One long-lived autocommit connection shared by all request threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=67108864;
+        ''')
+        
+        # In-memory copy of the watchlist, rebuilt lazily after any write. Writes from other
+        # connections (other gunicorn workers) are detected through PRAGMA data_version.
+        self._watchlist_cache = None
+        self._watchlist_index = None
+        self._data_version = None
+    
     def init_db(self) -> None:
         """Initialize the database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
+        with self._lock:
+            self._conn.execute('''
                 CREATE TABLE IF NOT EXISTS watchlist (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     ticker TEXT UNIQUE NOT NULL,
@@ -21,50 +38,81 @@ class DatabaseManager:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
-            conn.commit()
+            # ticker already has a UNIQUE index; this one serves ORDER BY added_at
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_watchlist_added_at ON watchlist (added_at)"
+            )
     
     def add_stock_to_watchlist(self, ticker: str, asset_type: str) -> bool:
         """Add a ticker to the watchlist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
+            with self._lock:
+                self._conn.execute(
                     "INSERT OR REPLACE INTO watchlist (ticker, asset_type, added_at) VALUES (?, ?, ?)",
                     (ticker.upper(), asset_type, datetime.datetime.now().isoformat())
                 )
-                conn.commit()
+                self._invalidate_watchlist()
                 return True
         except sqlite3.Error as e:
             print(f"Error adding stock to database: {e}")
             return False
     
+    def add_stocks_to_watchlist(self, rows: List[Tuple[str, str]]) -> int:
+        """Add several (ticker, asset_type) pairs in a single transaction"""
+        added_at = datetime.datetime.now().isoformat()
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    cursor = self._conn.executemany(
+                        "INSERT OR REPLACE INTO watchlist (ticker, asset_type, added_at) VALUES (?, ?, ?)",
+                        [(ticker.upper(), asset_type, added_at) for ticker, asset_type in rows]
+                    )
+                    self._conn.execute("COMMIT")
+                except sqlite3.Error:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._invalidate_watchlist()
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"Error adding stocks to database: {e}")
+            return 0
+    
     def remove_stock_from_watchlist(self, ticker: str) -> bool:
         """Remove a ticker from the watchlist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM watchlist WHERE ticker = ?", (ticker.upper(),))
-                conn.commit()
+            with self._lock:
+                cursor = self._conn.execute("DELETE FROM watchlist WHERE ticker = ?", (ticker.upper(),))
+                self._invalidate_watchlist()
                 return cursor.rowcount > 0
         except sqlite3.Error as e:
             print(f"Error removing stock from database: {e}")
             return False
     
+    def _invalidate_watchlist(self) -> None:
+        """Drop the cached watchlist; callers must hold self._lock"""
+        self._watchlist_cache = None
+        self._watchlist_index = None
+    
+    def _load_watchlist(self) -> Tuple[List[Dict[str, str]], Dict[str, Dict[str, str]]]:
+        """Cached watchlist and ticker index, re-read if the table changed; callers must hold self._lock"""
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._watchlist_cache is None or data_version != self._data_version:
+            cursor = self._conn.execute(
+                "SELECT ticker, asset_type, added_at FROM watchlist ORDER BY added_at DESC"
+            )
+            watchlist = [dict(row) for row in cursor.fetchall()]
+            self._watchlist_cache = watchlist
+            self._watchlist_index = {item['ticker']: item for item in watchlist}
+            self._data_version = data_version
+        return self._watchlist_cache, self._watchlist_index
+    
     def get_watchlist(self) -> List[Dict[str, str]]:
-        """Retrieve all tickers from the watchlist"""
+        """Retrieve all tickers from the watchlist (cached until the table changes)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT ticker, asset_type, added_at FROM watchlist ORDER BY added_at DESC")
-                rows = cursor.fetchall()
-                return [
-                    {
-                        'ticker': row[0],
-                        'asset_type': row[1],
-                        'added_at': row[2]
-                    }
-                    for row in rows
-                ]
+            with self._lock:
+                watchlist, _ = self._load_watchlist()
+                return watchlist
         except sqlite3.Error as e:
             print(f"Error retrieving watchlist: {e}")
             return []
@@ -72,31 +120,19 @@ class DatabaseManager:
     def get_ticker_info(self, ticker: str) -> Optional[Dict[str, str]]:
         """Get information for a specific ticker"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT ticker, asset_type, added_at FROM watchlist WHERE ticker = ?",
-                    (ticker.upper(),)
-                )
-                row = cursor.fetchone()
-                if row:
-                    return {
-                        'ticker': row[0],
-                        'asset_type': row[1],
-                        'added_at': row[2]
-                    }
-                return None
+            with self._lock:
+                _, watchlist_index = self._load_watchlist()
+                return watchlist_index.get(ticker.upper())
         except sqlite3.Error as e:
-            print(f"Error getting ticker info: {e}")
+            print(f"Error retrieving ticker info: {e}")
             return None
     
     def clear_watchlist(self) -> bool:
         """Clear all tickers from the watchlist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM watchlist")
-                conn.commit()
+            with self._lock:
+                self._conn.execute("DELETE FROM watchlist")
+                self._invalidate_watchlist()
                 return True
         except sqlite3.Error as e:
             print(f"Error clearing watchlist: {e}")
@@ -105,10 +141,14 @@ class DatabaseManager:
     def get_watchlist_count(self) -> int:
         """Get the number of tickers in the watchlist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM watchlist")
+            with self._lock:
+                cursor = self._conn.execute("SELECT COUNT(*) FROM watchlist")
                 return cursor.fetchone()[0]
         except sqlite3.Error as e:
             print(f"Error getting watchlist count: {e}")
-            return 0
\ No newline at end of file
+            return 0
+    
+    def close(self) -> None:
+        """Close the shared database connection"""
+        with self._lock:
+            self._conn.close()
\ No newline at end of file
@@ -0,0 +1,18 @@
+import multiprocessing
+import os
+
+# Gunicorn picks this file up automatically from the working directory.
+# Prefork one worker per core; each worker imports app.py itself (no preload),
+# so every process owns its own HTTP connection pool, caches and sqlite handle.
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = 8
+preload_app = False
+
+def post_worker_init(worker):
+    """Compile the indicator kernels before the worker accepts its first request"""
+    # Without the ta_kernels extension the kernels are JIT compiled (or loaded from
+    # Numba's cache) here rather than on the first request each worker serves
+    from technical_analysis import warm_up_kernels
+    warm_up_kernels()
@@ -0,0 +1,144 @@
+import numpy as np
+from numba import njit
+
+# Serial indicator kernels. build_kernels.py compiles these same functions ahead of time
+# into the ta_kernels extension; technical_analysis falls back to this JIT module when
+# that extension has not been built.
+
+@njit(cache=True, nogil=True, fastmath=True, boundscheck=False)
+def wilder_smooth(gain: np.ndarray, loss: np.ndarray, period: int) -> None:
+    """Replace gain/loss in place with their Wilder averages (SMA-seeded, NaN before `period`)"""
+    n = gain.size
+    if n <= period:
+        gain[:] = np.nan
+        loss[:] = np.nan
+        return
+    
+    avg_gain = gain[1:period + 1].mean()
+    avg_loss = loss[1:period + 1].mean()
+    gain[:period] = np.nan
+    loss[:period] = np.nan
+    gain[period] = avg_gain
+    loss[period] = avg_loss
+    for i in range(period + 1, n):
+        avg_gain = (avg_gain * (period - 1) + gain[i]) / period
+        avg_loss = (avg_loss * (period - 1) + loss[i]) / period
+        gain[i] = avg_gain
+        loss[i] = avg_loss
+
+@njit(cache=True, nogil=True)
+def adx_dmi(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int):
+    """Single-pass ADX, +DI and -DI using the same Wilder smoothing as ta's ADXIndicator"""
+    size = close.size
+    adx = np.zeros(size)
+    plus_di = np.zeros(size)
+    minus_di = np.zeros(size)
+    if size < window + 1:
+        return adx, plus_di, minus_di
+    
+    # True range and directional movement per bar (undefined for the first bar)
+    tr = np.zeros(size)
+    pos = np.zeros(size)
+    neg = np.zeros(size)
+    for j in range(1, size):
+        prev_close = close[j - 1]
+        tr[j] = max(high[j], prev_close) - min(low[j], prev_close)
+        up = high[j] - high[j - 1]
+        down = low[j - 1] - low[j]
+        if up > down and up > 0:
+            pos[j] = up
+        if down > up and down > 0:
+            neg[j] = down
+    
+    # Wilder running sums, seeded with the first `window` bars; like ta, the last
+    # smoothed slot is left at zero
+    m = size - (window - 1)
+    trs = np.zeros(m)
+    dip = np.zeros(m)
+    din = np.zeros(m)
+    trs[0] = tr[1:window + 1].sum()
+    dip[0] = pos[1:window + 1].sum()
+    din[0] = neg[1:window + 1].sum()
+    for i in range(1, m - 1):
+        trs[i] = trs[i - 1] - trs[i - 1] / window + tr[window + i]
+        dip[i] = dip[i - 1] - dip[i - 1] / window + pos[window + i]
+        din[i] = din[i - 1] - din[i - 1] / window + neg[window + i]
+    
+    dx = np.zeros(m)
+    for i in range(m):
+        p = 100.0 * dip[i] / trs[i] if trs[i] != 0 else 0.0
+        q = 100.0 * din[i] / trs[i] if trs[i] != 0 else 0.0
+        dx[i] = 100.0 * abs(p - q) / (p + q) if p + q != 0 else 0.0
+        if 1 <= i <= m - 2:
+            plus_di[i + window] = p
+            minus_di[i + window] = q
+    
+    if m > window:
+        avg = dx[:window].mean()
+        adx[2 * window - 1] = avg
+        for i in range(window + 1, m):
+            avg = (avg * (window - 1) + dx[i - 1]) / window
+            adx[window - 1 + i] = avg
+    return adx, plus_di, minus_di
+
+@njit(cache=True, nogil=True, fastmath=True)
+def ema_pair(close: np.ndarray, span_fast: int, span_slow: int):
+    """Fast and slow EMAs (ewm adjust=False) of the same series in a single pass over it"""
+    n = close.size
+    out_fast = np.empty(n)
+    out_slow = np.empty(n)
+    if n == 0:
+        return out_fast, out_slow
+    
+    alpha_fast = 2.0 / (span_fast + 1)
+    alpha_slow = 2.0 / (span_slow + 1)
+    ema_fast = ema_slow = close[0]
+    for i in range(n):
+        x = close[i]
+        ema_fast += alpha_fast * (x - ema_fast)
+        ema_slow += alpha_slow * (x - ema_slow)
+        out_fast[i] = ema_fast
+        out_slow[i] = ema_slow
+    return out_fast, out_slow
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def rsi_batch(close: np.ndarray, lengths: np.ndarray, period: int) -> np.ndarray:
+    """Row-wise RSI of head-padded (N, T) closes"""
+    n, width = close.shape
+    out = np.full((n, width), np.nan)
+    for row in range(n):
+        start = width - lengths[row]
+        if lengths[row] < period:
+            continue
+        size = lengths[row]
+        gain = np.zeros(size)
+        loss = np.zeros(size)
+        for j in range(1, size):
+            # Branchless split so the loop vectorises
+            delta = close[row, start + j] - close[row, start + j - 1]
+            gain[j] = max(delta, 0.0)
+            loss[j] = -min(delta, 0.0)
+        wilder_smooth(gain, loss, period)
+        for j in range(size):
+            # Spelled out rather than left to IEEE division: the AOT build raises on x / 0.
+            # No losses gives RSI 100, and no movement at all gives NaN as in calculate_rsi
+            if loss[j] == 0:
+                out[row, start + j] = 100.0 if gain[j] > 0 else np.nan
+            else:
+                out[row, start + j] = 100 + 1 / (gain[j] / loss[j] + 1) * -100
+    return out
+
+@njit(cache=True, nogil=True)
+def dmi_batch(high: np.ndarray, low: np.ndarray, close: np.ndarray, lengths: np.ndarray, window: int):
+    """Row-wise adx_dmi of head-padded (N, T) bars; padding columns are left at zero"""
+    n, width = close.shape
+    adx = np.zeros((n, width))
+    plus_di = np.zeros((n, width))
+    minus_di = np.zeros((n, width))
+    for row in range(n):
+        start = width - lengths[row]
+        row_adx, row_plus, row_minus = adx_dmi(high[row, start:], low[row, start:], close[row, start:], window)
+        adx[row, start:] = row_adx
+        plus_di[row, start:] = row_plus
+        minus_di[row, start:] = row_minus
+    return adx, plus_di, minus_di
\ No newline at end of file
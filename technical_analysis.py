@@ -1,40 +1,205 @@
 import pandas as pd
 import numpy as np
-from ta.trend import ADXIndicator
+from numpy.lib.stride_tricks import sliding_window_view
+from jit_kernels import (
+    wilder_smooth as _jit_wilder_smooth, adx_dmi as _jit_adx_dmi, ema_pair as _jit_ema_pair,
+    rsi_batch as _jit_rsi_batch, dmi_batch as _jit_dmi_batch
+)
 import plotly.graph_objects as go
-import plotly.utils
-import json
-from typing import Dict, Any, Optional, Tuple
+import plotly.io as pio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple, Callable, List, Sequence
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+try:
+    # Ahead-of-time build of the indicator kernels (python build_kernels.py), so a fresh
+    # worker does not JIT compile them on its first request
+    from ta_kernels import (
+        wilder_smooth as _wilder_smooth, adx_dmi as _adx_dmi, ema_pair as _ema_pair,
+        rsi_batch as _rsi_batch, dmi_batch as _dmi_batch
+    )
+except ImportError:
+    _wilder_smooth, _adx_dmi, _ema_pair = _jit_wilder_smooth, _jit_adx_dmi, _jit_ema_pair
+    _rsi_batch, _dmi_batch = _jit_rsi_batch, _jit_dmi_batch
+
+# Without SciPy, EMAs fall back to pandas' ewm on its Numba engine; set this to False
+# to use the Cython path instead and skip the one-off JIT compile on a cold start
+NUMBA_EWM = True
+
+def _ewm_mean(data, span: int) -> np.ndarray:
+    """pandas fallback for _ema/_ema_batch (EMAs run down the rows of `data`)"""
+    ewm = data.ewm(span=span, adjust=False)
+    if NUMBA_EWM:
+        return ewm.mean(engine='numba', engine_kwargs={'nopython': True, 'nogil': True}).to_numpy()
+    return ewm.mean().to_numpy()
+
+def _ema(x: np.ndarray, span: int) -> np.ndarray:
+    """EMA matching Series.ewm(span=span, adjust=False).mean(), run as a linear filter"""
+    if x.size == 0:
+        return np.empty(0)
+    if lfilter is None:
+        return _ewm_mean(pd.Series(x), span)
+    alpha = 2 / (span + 1)
+    # y[t] = alpha*x[t] + (1-alpha)*y[t-1], with the state primed so that y[0] = x[0]
+    out, _ = lfilter([alpha], [1, alpha - 1], x, zi=[x[0] * (1 - alpha)])
+    return out
+
+def _ema_batch(x: np.ndarray, span: int) -> np.ndarray:
+    """Row-wise _ema of an (N, T) array in a single lfilter call"""
+    if lfilter is None:
+        return _ewm_mean(pd.DataFrame(x.T), span).T
+    alpha = 2 / (span + 1)
+    out, _ = lfilter([alpha], [1, alpha - 1], x, axis=-1, zi=x[:, :1] * (1 - alpha))
+    return out
+
+# One row per watchlist entry from analyze_batch: each criterion's pass flag plus the
+# latest values it reports (NaN when the ticker has too few bars)
+RESULT_DTYPE = np.dtype([
+    ('has_bars', '?'),
+    ('rsi_ok', '?'), ('rsi', 'f8'),
+    ('macd_ok', '?'), ('macd', 'f8'), ('macd_signal', 'f8'),
+    ('weekly_macd_ok', '?'), ('weekly_macd', 'f8'), ('weekly_macd_signal', 'f8'),
+    ('ema_ok', '?'), ('ema_fast', 'f8'), ('ema_slow', 'f8'),
+    ('dmi_ok', '?'), ('adx', 'f8'), ('plus_di', 'f8'), ('minus_di', 'f8'),
+    ('squeeze_risk', '?'), ('rvol', 'f8'), ('resistance', 'f8'), ('price', 'f8')
+])
+
+def _stack_column(frames: Sequence[pd.DataFrame], column: str, width: int) -> np.ndarray:
+    """Stack one column of each frame into an (N, width) array aligned on the latest bar"""
+    out = np.full((len(frames), width), np.nan)
+    for row, df in enumerate(frames):
+        if len(df):
+            values = df[column].to_numpy(dtype=np.float64, copy=False)
+            # Pad the head with the first bar; an EMA of a constant run stays at that value,
+            # so the padding does not change any EMA-derived values
+            out[row, :width - len(values)] = values[0]
+            out[row, width - len(values):] = values
+    return out
+
+def warm_up_kernels() -> None:
+    """Compile (or load from Numba's cache) every indicator kernel with its runtime argument types"""
+    close = np.linspace(100.0, 110.0, 64)
+    lengths = np.array([close.size], dtype=np.int64)
+    _wilder_smooth(np.ones(close.size), np.ones(close.size), 14)
+    _adx_dmi(close + 1, close - 1, close, 14)
+    _ema_pair(close, 12, 26)
+    _ema(close, 9)
+    _rsi_batch(close[None, :], lengths, 14)
+    _dmi_batch(close[None, :] + 1, close[None, :] - 1, close[None, :], lengths, 14)
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """float64 values of one bar column; empty for a frame without bars"""
+    if df.empty:
+        return np.empty(0)
+    return df[name].to_numpy(dtype=np.float64, copy=False)
+
+def _line_trace(x, y: np.ndarray, name: str, color: str) -> Dict[str, Any]:
+    """Plain-dict line trace; values are sent as float32, plenty for a chart and half the payload"""
+    return {
+        "type": "scatter",
+        "x": x,
+        "y": np.asarray(y, dtype=np.float32),
+        "mode": "lines",
+        "name": name,
+        "line": {"color": color}
+    }
+
+def _hline(y: float, color: str) -> Dict[str, Any]:
+    """Dashed horizontal guide across the plot, as produced by Figure.add_hline"""
+    return {
+        "type": "line", "xref": "x domain", "x0": 0, "x1": 1, "yref": "y", "y0": y, "y1": y,
+        "line": {"color": color, "dash": "dash"}
+    }
+
+def _fig_to_json(fig: go.Figure) -> str:
+    """Serialize a figure to JSON with orjson when available"""
+    # plotly.io cleans dates and object arrays into orjson-safe values first; the figure
+    # was validated on construction, so that pass is skipped here
+    return pio.to_json(fig, validate=False, engine='orjson' if orjson is not None else 'json')
 
 class TechnicalAnalyzer:
     
-    def calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
+    def __init__(self):
+        """Initialize the analyzer and its per-DataFrame indicator cache"""
+        # Indicator results keyed by id() of the input frame; an entry is dropped as
+        # soon as its frame is garbage collected, so ids are never reused stale.
+        # Input frames (the API client's cached bars) are treated as immutable.
+        self._indicator_cache: Dict[int, Dict[tuple, Any]] = {}
+        self._indicator_lock = threading.Lock()
+    
+    def _memoize(self, df: pd.DataFrame, key: tuple, compute: Callable, *args) -> Any:
+        """Return compute(*args) for (df, key), reusing a previous result for the same frame"""
+        df_id = id(df)
+        with self._indicator_lock:
+            entries = self._indicator_cache.get(df_id)
+            if entries is None:
+                entries = self._indicator_cache[df_id] = {}
+                weakref.finalize(df, self._indicator_cache.pop, df_id, None)
+            elif key in entries:
+                return entries[key]
+        
+        value = compute(*args)
+        with self._indicator_lock:
+            entries[key] = value
+        return value
+    
+    def calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> np.ndarray:
         """Calculate RSI using Wilder's method"""
         if 'Close' not in df.columns or len(df) < period:
-            return pd.Series(dtype='float64')
+            return np.empty(0)
         
-        delta = df['Close'].diff()
-        gain = delta.clip(lower=0)
-        loss = -delta.clip(upper=0)
-        avg_gain = gain.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return self._memoize(df, ('rsi', period), self._compute_rsi, _column(df, 'Close'), period)
     
-    def check_rsi_condition(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _compute_rsi(self, close: np.ndarray, period: int) -> np.ndarray:
+        """Uncached RSI calculation behind calculate_rsi"""
+        # Only the Wilder recursion is sequential; every other step is an in-place ufunc
+        # on two reused buffers so no intermediate Series or arrays are allocated
+        delta = np.diff(close, prepend=close[0])
+        gain = np.maximum(delta, 0.0, out=np.empty_like(delta))
+        # loss = -min(delta, 0), negated in place to avoid a -delta temporary
+        loss = np.minimum(delta, 0.0, out=delta)
+        np.negative(loss, out=loss)
+        _wilder_smooth(gain, loss, period)
+        
+        # rsi = 100 - 100 / (1 + avg_gain / avg_loss), built up in the gain buffer
+        rs = gain
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs /= loss
+        rs += 1
+        np.reciprocal(rs, out=rs)
+        rs *= -100
+        rs += 100
+        return rs
+    
+    def check_rsi_condition(self, rsi: np.ndarray) -> Dict[str, Any]:
         """Check if RSI is between 30-60 and rising"""
-        if 'RSI' not in df.columns or len(df['RSI'].dropna()) < 2:
+        # RSI is only undefined during its warm-up, so the last two values decide it
+        recent_rsi = rsi[-2:]
+        if len(recent_rsi) < 2 or np.isnan(recent_rsi).any():
             return {"status": "❌", "message": "Not enough RSI data", "value": None}
         
-        recent_rsi = df['RSI'].dropna().iloc[-2:]
-        current_rsi = recent_rsi.iloc[-1]
-        previous_rsi = recent_rsi.iloc[-2]
+        previous_rsi, current_rsi = recent_rsi
         
         is_in_range = (30 <= current_rsi <= 60) and (30 <= previous_rsi <= 60)
         is_rising = current_rsi > previous_rsi
-        
-        if is_in_range and is_rising:
+        return self._rsi_verdict(is_in_range and is_rising, current_rsi)
+    
+    @staticmethod
+    def _rsi_verdict(passed: bool, current_rsi: float) -> Dict[str, Any]:
+        """Result of the RSI criterion for the latest RSI value"""
+        if passed:
             return {
                 "status": "✅", 
                 "message": f"RSI is between 30-60 and rising ({current_rsi:.2f})",
@@ -46,34 +211,43 @@ class TechnicalAnalyzer:
             "value": current_rsi
         }
     
-    def get_macd(self, data: pd.DataFrame, fast: int = 12, slow: int = 26, signal_period: int = 9) -> Tuple[pd.Series, pd.Series]:
+    def get_macd(self, data: pd.DataFrame, fast: int = 12, slow: int = 26, signal_period: int = 9) -> Tuple[np.ndarray, np.ndarray]:
         """Calculate MACD and Signal Line"""
         if len(data) < slow:
-            return pd.Series(dtype='float64'), pd.Series(dtype='float64')
+            return np.empty(0), np.empty(0)
         
-        ema_fast = data['Close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = data['Close'].ewm(span=slow, adjust=False).mean()
+        return self._memoize(data, ('macd', fast, slow, signal_period), self._compute_macd,
+                             _column(data, 'Close'), fast, slow, signal_period)
+    
+    def _compute_macd(self, close: np.ndarray, fast: int, slow: int,
+                      signal_period: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Uncached MACD calculation behind get_macd"""
+        # Both EMAs come from one pass over the closes
+        ema_fast, ema_slow = _ema_pair(close, fast, slow)
         macd = ema_fast - ema_slow
-        signal_line = macd.ewm(span=signal_period, adjust=False).mean()
+        signal_line = _ema(macd, signal_period)
         return macd, signal_line
     
-    def check_macd_crossover_or_rising(self, macd: pd.Series, signal: pd.Series) -> Dict[str, Any]:
+    def check_macd_crossover_or_rising(self, macd: np.ndarray, signal: np.ndarray) -> Dict[str, Any]:
         """Check for bullish MACD crossover or rising MACD"""
-        macd = macd.dropna()
-        signal = signal.dropna()
+        # Only the last two points matter; EMAs of a finite close series have no gaps
+        macd_tail = macd[-2:]
+        signal_tail = signal[-2:]
         
-        if len(macd) < 2 or len(signal) < 2:
+        if len(macd_tail) < 2 or len(signal_tail) < 2 or np.isnan(macd_tail).any() or np.isnan(signal_tail).any():
             return {"status": "❌", "message": "Not enough MACD data", "value": None}
         
-        macd_last = float(macd.iloc[-1])
-        macd_prev = float(macd.iloc[-2])
-        signal_last = float(signal.iloc[-1])
-        signal_prev = float(signal.iloc[-2])
+        macd_prev, macd_last = float(macd_tail[0]), float(macd_tail[1])
+        signal_prev, signal_last = float(signal_tail[0]), float(signal_tail[1])
         
         crossover = (macd_last > signal_last) and (macd_prev <= signal_prev)
         is_rising = macd_last > macd_prev
-        
-        if crossover or is_rising:
+        return self._macd_verdict(crossover or is_rising, macd_last, signal_last)
+    
+    @staticmethod
+    def _macd_verdict(passed: bool, macd_last: float, signal_last: float) -> Dict[str, Any]:
+        """Result of a MACD criterion for the latest MACD and signal values"""
+        if passed:
             return {
                 "status": "✅", 
                 "message": "MACD is rising or has crossed above the signal line",
@@ -85,52 +259,61 @@ class TechnicalAnalyzer:
             "value": {"macd": macd_last, "signal": signal_last}
         }
     
-    def check_dmi_trend(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def get_dmi(self, df: pd.DataFrame, window: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculate ADX, +DI and -DI"""
+        # ADX needs two full windows before its first value
+        if len(df) < 2 * window:
+            return np.empty(0), np.empty(0), np.empty(0)
+        
+        return self._memoize(df, ('dmi', window), _adx_dmi,
+                             _column(df, 'High'), _column(df, 'Low'), _column(df, 'Close'), window)
+    
+    def check_dmi_trend(self, adx_values: np.ndarray, plus_di: np.ndarray, minus_di: np.ndarray) -> Dict[str, Any]:
         """Check for bullish DMI trend confirmation"""
-        if len(df) < 28:
+        if len(adx_values) < 28:
             return {"status": "❌", "message": "Not enough data for DMI calculation", "value": None}
         
-        try:
-            adx = ADXIndicator(high=df['High'], low=df['Low'], close=df['Close'], window=14)
-            adx_values = adx.adx()
-            plus_di = adx.adx_pos()
-            minus_di = adx.adx_neg()
-            
-            last_adx = float(adx_values.iloc[-1])
-            last_plus_di = float(plus_di.iloc[-1])
-            last_minus_di = float(minus_di.iloc[-1])
-            
-            if last_adx > 20 and last_plus_di > last_minus_di:
-                return {
-                    "status": "✅",
-                    "message": f"Bullish DMI trend confirmed (ADX: {last_adx:.2f})",
-                    "value": {"adx": last_adx, "plus_di": last_plus_di, "minus_di": last_minus_di}
-                }
+        last_adx = float(adx_values[-1])
+        last_plus_di = float(plus_di[-1])
+        last_minus_di = float(minus_di[-1])
+        
+        return self._dmi_verdict(last_adx > 20 and last_plus_di > last_minus_di,
+                                 last_adx, last_plus_di, last_minus_di)
+    
+    @staticmethod
+    def _dmi_verdict(passed: bool, last_adx: float, last_plus_di: float, last_minus_di: float) -> Dict[str, Any]:
+        """Result of the DMI criterion for the latest ADX, +DI and -DI"""
+        if passed:
             return {
-                "status": "❌",
-                "message": f"DMI condition not met (ADX: {last_adx:.2f})",
+                "status": "✅",
+                "message": f"Bullish DMI trend confirmed (ADX: {last_adx:.2f})",
                 "value": {"adx": last_adx, "plus_di": last_plus_di, "minus_di": last_minus_di}
             }
-        except Exception as e:
-            return {"status": "❌", "message": f"Error calculating DMI: {e}", "value": None}
+        return {
+            "status": "❌",
+            "message": f"DMI condition not met (ADX: {last_adx:.2f})",
+            "value": {"adx": last_adx, "plus_di": last_plus_di, "minus_di": last_minus_di}
+        }
     
-    def check_ema_crossover(self, df: pd.DataFrame, fast: int = 8, slow: int = 21) -> Dict[str, Any]:
+    def check_ema_crossover(self, close: np.ndarray, fast: int = 8, slow: int = 21) -> Dict[str, Any]:
         """Check for bullish EMA crossover"""
-        if len(df) < slow:
+        if len(close) < slow:
             return {"status": "❌", "message": "Not enough data for EMA calculation", "value": None}
         
-        ema_fast = df['Close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = df['Close'].ewm(span=slow, adjust=False).mean()
+        ema_fast = _ema(close, fast)
+        ema_slow = _ema(close, slow)
         
-        if len(df) < 2:
+        if len(close) < 2:
             return {"status": "❌", "message": "Not enough data to check for crossover", "value": None}
         
-        prev_fast = float(ema_fast.iloc[-2])
-        prev_slow = float(ema_slow.iloc[-2])
-        curr_fast = float(ema_fast.iloc[-1])
-        curr_slow = float(ema_slow.iloc[-1])
-        
-        if (prev_fast <= prev_slow) and (curr_fast > curr_slow):
+        prev_fast, curr_fast = float(ema_fast[-2]), float(ema_fast[-1])
+        prev_slow, curr_slow = float(ema_slow[-2]), float(ema_slow[-1])
+        return self._ema_verdict((prev_fast <= prev_slow) and (curr_fast > curr_slow), curr_fast, curr_slow)
+    
+    @staticmethod
+    def _ema_verdict(passed: bool, curr_fast: float, curr_slow: float) -> Dict[str, Any]:
+        """Result of the EMA crossover criterion for the latest fast and slow EMAs"""
+        if passed:
             return {
                 "status": "✅",
                 "message": "EMA 8 just crossed above EMA 21",
@@ -142,41 +325,183 @@ class TechnicalAnalyzer:
             "value": {"ema_fast": curr_fast, "ema_slow": curr_slow}
         }
     
-    def check_short_squeeze_risk(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def check_short_squeeze_risk(self, close: np.ndarray, volume: np.ndarray) -> Dict[str, Any]:
         """Check for potential short squeeze risk"""
-        if len(df) < 30:
+        if len(close) < 30:
             return {"status": "❌", "message": "Not enough data for squeeze analysis", "value": None}
         
         try:
-            ma20 = df['Close'].rolling(window=20).mean()
-            volume_avg20 = df['Volume'].rolling(window=20).mean()
-            rvol = df['Volume'] / volume_avg20
-            resistance = df['Close'].rolling(window=30).max().shift(1)
-            
-            last_row = df.iloc[-1]
-            last_close = float(last_row['Close'])
-            last_resistance = float(resistance.iloc[-1])
-            last_rvol = float(rvol.iloc[-1])
+            # Only the latest bar is inspected, so compute just the tail values
+            last_close = float(close[-1])
+            # Relative volume against the 20-bar average that includes the latest bar
+            last_rvol = float(volume[-1] / volume[-20:].mean())
+            # Resistance is the highest close of the 30 bars before the latest one; only the
+            # last rolling window is reduced, read through a zero-copy view
+            if len(close) > 30:
+                last_resistance = float(sliding_window_view(close[:-1], 30)[-1].max())
+            else:
+                last_resistance = float('nan')
             
             has_breakout = (last_close > last_resistance) and (last_rvol > 2)
-            
-            if has_breakout:
-                return {
-                    "status": "⚠️",
-                    "message": f"Potential short squeeze risk detected! Price broke resistance on high relative volume (RVOL: {last_rvol:.2f})",
-                    "value": {"rvol": last_rvol, "resistance": last_resistance, "price": last_close}
-                }
+            return self._squeeze_verdict(has_breakout, last_rvol, last_resistance, last_close)
+        except Exception as e:
+            return {"status": "❌", "message": f"Error analyzing squeeze risk: {e}", "value": None}
+    
+    @staticmethod
+    def _squeeze_verdict(has_breakout: bool, last_rvol: float, last_resistance: float,
+                         last_close: float) -> Dict[str, Any]:
+        """Result of the short squeeze criterion for the latest bar"""
+        if has_breakout:
             return {
-                "status": "✅",
-                "message": "No major short squeeze risk detected",
+                "status": "⚠️",
+                "message": f"Potential short squeeze risk detected! Price broke resistance on high relative volume (RVOL: {last_rvol:.2f})",
                 "value": {"rvol": last_rvol, "resistance": last_resistance, "price": last_close}
             }
-        except Exception as e:
-            return {"status": "❌", "message": f"Error analyzing squeeze risk: {e}", "value": None}
+        return {
+            "status": "✅",
+            "message": "No major short squeeze risk detected",
+            "value": {"rvol": last_rvol, "resistance": last_resistance, "price": last_close}
+        }
+    
+    def analyze_batch(self, tickers: Sequence[Dict[str, str]], daily_frames: Sequence[pd.DataFrame],
+                      weekly_frames: Sequence[pd.DataFrame], criteria: dict) -> np.ndarray:
+        """Evaluate the indicator criteria for many watchlist entries at once, as RESULT_DTYPE records"""
+        # Every ticker's bars are stacked into (N, T) arrays aligned on the latest bar, so each
+        # indicator runs once for the whole watchlist and each check is a comparison of the
+        # last columns. Values stay NaN where a ticker has too few bars; checks_from_batch
+        # turns the records into the same dicts as the single-ticker check_* methods.
+        records = np.zeros(len(tickers), dtype=RESULT_DTYPE)
+        for name in RESULT_DTYPE.names:
+            if RESULT_DTYPE[name] == np.float64:
+                records[name] = np.nan
+        if not tickers:
+            return records
+        
+        weekly_len = np.array([len(df) for df in weekly_frames], dtype=np.int64)
+        daily_len = np.array([len(df) for df in daily_frames], dtype=np.int64)
+        any_stock = any(item['asset_type'] == 'Stock' for item in tickers)
+        # Like analyze_ticker, nothing is evaluated for a ticker without primary bars
+        records['has_bars'] = weekly_len > 0
+        
+        weekly_close = _stack_column(weekly_frames, 'Close', max(int(weekly_len.max()), 2))
+        daily_width = max(int(daily_len.max()), 2)
+        daily_close = _stack_column(daily_frames, 'Close', daily_width)
+        
+        if criteria.get('rsi_confirmation'):
+            rsi = _rsi_batch(weekly_close, weekly_len, 14)
+            previous_rsi, current_rsi = rsi[:, -2], rsi[:, -1]
+            enough = ~(np.isnan(previous_rsi) | np.isnan(current_rsi))
+            records['rsi_ok'] = ((30 <= current_rsi) & (current_rsi <= 60) & (30 <= previous_rsi)
+                                 & (previous_rsi <= 60) & (current_rsi > previous_rsi))
+            records['rsi'] = np.where(enough, current_rsi, np.nan)
+        
+        if criteria.get('dmi_confirmation') and any_stock:
+            adx, plus_di, minus_di = _dmi_batch(
+                _stack_column(daily_frames, 'High', daily_width),
+                _stack_column(daily_frames, 'Low', daily_width),
+                daily_close, daily_len, 14
+            )
+            enough = daily_len >= 28
+            records['dmi_ok'] = (adx[:, -1] > 20) & (plus_di[:, -1] > minus_di[:, -1])
+            records['adx'] = np.where(enough, adx[:, -1], np.nan)
+            records['plus_di'] = np.where(enough, plus_di[:, -1], np.nan)
+            records['minus_di'] = np.where(enough, minus_di[:, -1], np.nan)
+        
+        if criteria.get('ema_crossover') and any_stock:
+            ema_fast = _ema_batch(daily_close, 8)
+            ema_slow = _ema_batch(daily_close, 21)
+            enough = daily_len >= 21
+            records['ema_ok'] = (ema_fast[:, -2] <= ema_slow[:, -2]) & (ema_fast[:, -1] > ema_slow[:, -1])
+            records['ema_fast'] = np.where(enough, ema_fast[:, -1], np.nan)
+            records['ema_slow'] = np.where(enough, ema_slow[:, -1], np.nan)
+        
+        macd_inputs = []
+        if criteria.get('macd_crossover'):
+            macd_inputs.append(('macd', daily_close, daily_len, 8, 21, 9))
+        if criteria.get('weekly_macd'):
+            macd_inputs.append(('weekly_macd', weekly_close, weekly_len, 12, 26, 9))
+        for prefix, close, lengths, fast, slow, signal_period in macd_inputs:
+            if not any_stock:
+                break
+            macd = _ema_batch(close, fast) - _ema_batch(close, slow)
+            signal_line = _ema_batch(macd, signal_period)
+            enough = lengths >= slow
+            records[f'{prefix}_ok'] = (((macd[:, -1] > signal_line[:, -1]) & (macd[:, -2] <= signal_line[:, -2]))
+                                       | (macd[:, -1] > macd[:, -2]))
+            records[prefix] = np.where(enough, macd[:, -1], np.nan)
+            records[f'{prefix}_signal'] = np.where(enough, signal_line[:, -1], np.nan)
+        
+        if criteria.get('avoid_squeeze') and any_stock:
+            volume = _stack_column(daily_frames, 'Volume', daily_width)
+            enough = daily_len >= 30
+            last_close = daily_close[:, -1]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                last_rvol = volume[:, -1] / volume[:, -20:].mean(axis=1)
+            # Highest close of the 30 bars before the latest one, defined only with 31+ bars
+            last_resistance = np.where(daily_len > 30, daily_close[:, -31:-1].max(axis=1), np.nan)
+            records['squeeze_risk'] = (last_close > last_resistance) & (last_rvol > 2)
+            records['rvol'] = np.where(enough, last_rvol, np.nan)
+            records['resistance'] = np.where(enough, last_resistance, np.nan)
+            records['price'] = np.where(enough, last_close, np.nan)
+        
+        return records
+    
+    def checks_from_batch(self, tickers: Sequence[Dict[str, str]], records: np.ndarray,
+                          criteria: dict) -> List[Dict[str, Any]]:
+        """Per-ticker check dicts for analyze_ticker, built from analyze_batch records"""
+        def lacking(message):
+            return {"status": "❌", "message": message, "value": None}
+        
+        results = []
+        for item, record in zip(tickers, records):
+            checks = {}
+            results.append(checks)
+            if not record['has_bars']:
+                continue
+            is_stock = item['asset_type'] == 'Stock'
+            
+            # A NaN value means the ticker had too few bars for that indicator
+            if criteria.get('rsi_confirmation'):
+                checks['rsi_confirmation'] = (
+                    self._rsi_verdict(bool(record['rsi_ok']), record['rsi']) if not np.isnan(record['rsi'])
+                    else lacking("Not enough RSI data")
+                )
+            
+            if criteria.get('dmi_confirmation') and is_stock:
+                checks['dmi_confirmation'] = (
+                    self._dmi_verdict(bool(record['dmi_ok']), float(record['adx']), float(record['plus_di']),
+                                      float(record['minus_di'])) if not np.isnan(record['adx'])
+                    else lacking("Not enough data for DMI calculation")
+                )
+            
+            if criteria.get('ema_crossover') and is_stock:
+                checks['ema_crossover'] = (
+                    self._ema_verdict(bool(record['ema_ok']), float(record['ema_fast']), float(record['ema_slow']))
+                    if not np.isnan(record['ema_fast'])
+                    else lacking("Not enough data for EMA calculation")
+                )
+            
+            for key, prefix in (('macd_crossover', 'macd'), ('weekly_macd', 'weekly_macd')):
+                if criteria.get(key) and is_stock:
+                    checks[key] = (
+                        self._macd_verdict(bool(record[f'{prefix}_ok']), float(record[prefix]),
+                                           float(record[f'{prefix}_signal'])) if not np.isnan(record[prefix])
+                        else lacking("Not enough MACD data")
+                    )
+            
+            if criteria.get('avoid_squeeze') and is_stock:
+                checks['avoid_squeeze'] = (
+                    self._squeeze_verdict(bool(record['squeeze_risk']), float(record['rvol']),
+                                          float(record['resistance']), float(record['price']))
+                    if not np.isnan(record['price'])
+                    else lacking("Not enough data for squeeze analysis")
+                )
+        return results
     
     def analyze_ticker(self, ticker: str, asset_type: str, data_df: pd.DataFrame, 
-                      daily_df: pd.DataFrame, current_price: float, criteria: dict, api_client) -> Optional[Dict[str, Any]]:
-        """Analyze a single ticker against all selected criteria"""
+                      daily_df: pd.DataFrame, current_price: float, criteria: dict, api_client,
+                      checks: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Analyze a single ticker against all selected criteria (indicator checks may come from analyze_batch)"""
         result = {
             "ticker": ticker,
             "asset_type": asset_type,
@@ -184,16 +509,21 @@ class TechnicalAnalyzer:
         }
         
         # Run analyses based on criteria
-        if not data_df.empty:
+        if checks is not None:
+            result.update(checks)
+        elif not data_df.empty:
+            # Resolve the daily columns once; RSI, MACD and DMI come from the per-frame cache
+            close_d = _column(daily_df, 'Close')
+            volume_d = _column(daily_df, 'Volume')
+            
             if criteria.get('rsi_confirmation'):
-                data_df['RSI'] = self.calculate_rsi(data_df)
-                result['rsi_confirmation'] = self.check_rsi_condition(data_df)
+                result['rsi_confirmation'] = self.check_rsi_condition(self.calculate_rsi(data_df))
             
             if criteria.get('dmi_confirmation') and asset_type == 'Stock':
-                result['dmi_confirmation'] = self.check_dmi_trend(daily_df)
+                result['dmi_confirmation'] = self.check_dmi_trend(*self.get_dmi(daily_df))
             
             if criteria.get('ema_crossover') and asset_type == 'Stock':
-                result['ema_crossover'] = self.check_ema_crossover(daily_df)
+                result['ema_crossover'] = self.check_ema_crossover(close_d)
             
             if criteria.get('macd_crossover') and asset_type == 'Stock':
                 daily_macd, daily_signal = self.get_macd(daily_df, fast=8, slow=21, signal_period=9)
@@ -204,7 +534,7 @@ class TechnicalAnalyzer:
                 result['weekly_macd'] = self.check_macd_crossover_or_rising(weekly_macd, weekly_signal)
             
             if criteria.get('avoid_squeeze') and asset_type == 'Stock':
-                result['avoid_squeeze'] = self.check_short_squeeze_risk(daily_df)
+                result['avoid_squeeze'] = self.check_short_squeeze_risk(close_d, volume_d)
         
         if criteria.get('next_earning_date') and asset_type == 'Stock':
             earnings_date, earnings_error = api_client.get_next_earnings_date(ticker)
@@ -216,135 +546,106 @@ class TechnicalAnalyzer:
         
         return result
     
+    def analyze_many(self, tickers: Sequence[Dict[str, str]], frames_map: Dict[str, Tuple[pd.DataFrame, pd.DataFrame, float]],
+                     criteria: dict, api_client,
+                     checks_map: Optional[Dict[str, Dict[str, Any]]] = None,
+                     keep: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """Run analyze_ticker for many watchlist entries in input order, keeping the results `keep` accepts"""
+        def analyze(item):
+            weekly_df, daily_df, current_price = frames_map[item['ticker']]
+            checks = checks_map.get(item['ticker']) if checks_map is not None else None
+            result = self.analyze_ticker(item['ticker'], item['asset_type'], weekly_df, daily_df,
+                                         current_price, criteria, api_client, checks)
+            return result if result and (keep is None or keep(result)) else None
+        
+        if criteria.get('next_earning_date') and tickers:
+            # Earnings lookups block on the network, so overlap them on a pool sized like the
+            # default executor; without them each ticker is only a few dict builds
+            max_workers = min(len(tickers), 32, (os.cpu_count() or 1) + 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                return [result for result in pool.map(analyze, tickers) if result is not None]
+        return [result for result in map(analyze, tickers) if result is not None]
+    
     def generate_chart(self, ticker: str, chart_type: str, daily_df: pd.DataFrame, 
                       weekly_df: pd.DataFrame, asset_type: str) -> str:
         """Generate Plotly chart JSON for a specific chart type"""
-        fig = go.Figure()
+        # Traces and guides are plain dicts so the figure is validated once, on construction
+        traces = []
+        layout = {}
         
         try:
             if chart_type == 'rsi' and not daily_df.empty:
                 rsi = self.calculate_rsi(daily_df)
-                fig.add_trace(go.Scatter(
-                    x=daily_df.index,
-                    y=rsi,
-                    mode='lines',
-                    name='RSI',
-                    line=dict(color='purple')
-                ))
-                fig.add_hline(y=70, line_dash="dash", line_color="red")
-                fig.add_hline(y=30, line_dash="dash", line_color="green")
-                fig.update_layout(title=f'{ticker} RSI', yaxis_title='RSI')
+                traces = [_line_trace(daily_df.index, rsi, 'RSI', 'purple')]
+                layout = {
+                    "title": f'{ticker} RSI', "yaxis": {"title": 'RSI'},
+                    "shapes": [_hline(70, 'red'), _hline(30, 'green')]
+                }
             
             elif chart_type == 'macd' and not daily_df.empty:
                 macd, signal = self.get_macd(daily_df, fast=8, slow=21, signal_period=9)
-                fig.add_trace(go.Scatter(
-                    x=daily_df.index,
-                    y=macd,
-                    mode='lines',
-                    name='MACD',
-                    line=dict(color='blue')
-                ))
-                fig.add_trace(go.Scatter(
-                    x=daily_df.index,
-                    y=signal,
-                    mode='lines',
-                    name='Signal',
-                    line=dict(color='red')
-                ))
-                fig.add_hline(y=0, line_dash="dash", line_color="gray")
-                fig.update_layout(title=f'{ticker} Daily MACD', yaxis_title='MACD')
+                traces = [
+                    _line_trace(daily_df.index, macd, 'MACD', 'blue'),
+                    _line_trace(daily_df.index, signal, 'Signal', 'red')
+                ]
+                layout = {
+                    "title": f'{ticker} Daily MACD', "yaxis": {"title": 'MACD'},
+                    "shapes": [_hline(0, 'gray')]
+                }
             
             elif chart_type == 'weekly_macd' and not weekly_df.empty:
                 macd, signal = self.get_macd(weekly_df)
-                fig.add_trace(go.Scatter(
-                    x=weekly_df.index,
-                    y=macd,
-                    mode='lines',
-                    name='Weekly MACD',
-                    line=dict(color='blue')
-                ))
-                fig.add_trace(go.Scatter(
-                    x=weekly_df.index,
-                    y=signal,
-                    mode='lines',
-                    name='Weekly Signal',
-                    line=dict(color='red')
-                ))
-                fig.add_hline(y=0, line_dash="dash", line_color="gray")
-                fig.update_layout(title=f'{ticker} Weekly MACD', yaxis_title='MACD')
+                traces = [
+                    _line_trace(weekly_df.index, macd, 'Weekly MACD', 'blue'),
+                    _line_trace(weekly_df.index, signal, 'Weekly Signal', 'red')
+                ]
+                layout = {
+                    "title": f'{ticker} Weekly MACD', "yaxis": {"title": 'MACD'},
+                    "shapes": [_hline(0, 'gray')]
+                }
             
             elif chart_type == 'ema' and not daily_df.empty:
-                ema8 = daily_df['Close'].ewm(span=8, adjust=False).mean()
-                ema21 = daily_df['Close'].ewm(span=21, adjust=False).mean()
-                
-                fig.add_trace(go.Scatter(
-                    x=daily_df.index,
-                    y=daily_df['Close'],
-                    mode='lines',
-                    name='Close Price',
-                    line=dict(color='black')
-                ))
-                fig.add_trace(go.Scatter(
-                    x=daily_df.index,
-                    y=ema8,
-                    mode='lines',
-                    name='EMA 8',
-                    line=dict(color='blue')
-                ))
-                fig.add_trace(go.Scatter(
-                    x=daily_df.index,
-                    y=ema21,
-                    mode='lines',
-                    name='EMA 21',
-                    line=dict(color='red')
-                ))
-                fig.update_layout(title=f'{ticker} EMA Crossover', yaxis_title='Price')
+                close = _column(daily_df, 'Close')
+                traces = [
+                    _line_trace(daily_df.index, close, 'Close Price', 'black'),
+                    _line_trace(daily_df.index, _ema(close, 8), 'EMA 8', 'blue'),
+                    _line_trace(daily_df.index, _ema(close, 21), 'EMA 21', 'red')
+                ]
+                layout = {"title": f'{ticker} EMA Crossover', "yaxis": {"title": 'Price'}}
             
             elif chart_type == 'dmi' and not daily_df.empty:
-                adx = ADXIndicator(high=daily_df['High'], low=daily_df['Low'], close=daily_df['Close'], window=14)
-                
-                fig.add_trace(go.Scatter(
-                    x=daily_df.index[-60:],
-                    y=adx.adx_pos().iloc[-60:],
-                    mode='lines',
-                    name='+DI',
-                    line=dict(color='green')
-                ))
-                fig.add_trace(go.Scatter(
-                    x=daily_df.index[-60:],
-                    y=adx.adx_neg().iloc[-60:],
-                    mode='lines',
-                    name='-DI',
-                    line=dict(color='red')
-                ))
-                fig.add_trace(go.Scatter(
-                    x=daily_df.index[-60:],
-                    y=adx.adx().iloc[-60:],
-                    mode='lines',
-                    name='ADX',
-                    line=dict(color='blue')
-                ))
-                fig.add_hline(y=20, line_dash="dash", line_color="gray")
-                fig.update_layout(title=f'{ticker} DMI Indicators (Last 60 Days)', yaxis_title='DMI')
+                adx_values, plus_di, minus_di = self.get_dmi(daily_df)
+                dates = daily_df.index[-60:]
+                traces = [
+                    _line_trace(dates, plus_di[-60:], '+DI', 'green'),
+                    _line_trace(dates, minus_di[-60:], '-DI', 'red'),
+                    _line_trace(dates, adx_values[-60:], 'ADX', 'blue')
+                ]
+                layout = {
+                    "title": f'{ticker} DMI Indicators (Last 60 Days)', "yaxis": {"title": 'DMI'},
+                    "shapes": [_hline(20, 'gray')]
+                }
             
-            # Update layout for all charts
-            fig.update_layout(
+            # Layout shared by all charts
+            layout.update(
                 template='plotly_dark',
                 height=400,
                 margin=dict(l=40, r=40, t=40, b=40),
                 showlegend=True
             )
             
-            return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-            
+            return _fig_to_json(go.Figure(data=traces, layout=layout))
+        
         except Exception as e:
             # Return empty chart with error message
-            fig = go.Figure()
-            fig.add_annotation(
-                text=f"Error generating chart: {str(e)}",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5,
-                showarrow=False
-            )
-            fig.update_layout(template='plotly_dark', height=400)
-            return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
\ No newline at end of file
+            fig = go.Figure(layout={
+                "annotations": [{
+                    "text": f"Error generating chart: {str(e)}",
+                    "xref": "paper", "yref": "paper",
+                    "x": 0.5, "y": 0.5,
+                    "showarrow": False
+                }],
+                "template": 'plotly_dark',
+                "height": 400
+            })
+            return _fig_to_json(fig)
\ No newline at end of file